@@ -18,7 +18,7 @@ from forest import Forest
 
 
 class Analyse:
-    def __init__(self, L, f, freeze_time_during_fire, remember_history, timesteps, instances, lake_proportion=0, include_lakes=None):
+    def __init__(self, L, f, freeze_time_during_fire, remember_history, timesteps, instances, lake_proportion=0, include_lakes=None, census_stride=None, progress=None, seed=None):
         self.ims = []
         self.instances = instances
         self.best_fitting_distributions = 'Not yet calculated'
@@ -35,6 +35,15 @@ class Analyse:
         self.all_fire_lengths = []
         self.all_fire_durations = []
         self.all_fire_durations_per_instance = []
+        self.census_stride = census_stride
+        self.cluster_census = []
+
+        # Instance i is seeded with seed + i, so runs with a seed are reproducible
+        self.seed = seed
+
+        # Optional ProgressReporter, messages are labeled with the parameter values
+        self.progress = progress
+        self.label = f'L={L}, f={f}, p={lake_proportion}'
     
         if self.remember_history:
             animation_fig, animation_ax = plt.subplots()
@@ -46,18 +55,28 @@ class Analyse:
         Run one forest fire model for the specified parameters. Save data regarding fire sizes,
         tree time series and fire duration.
         """
-        forest = Forest(self.L, self.f, self.freeze_time_during_fire, self.timesteps, include_lakes=self.include_lakes, lake_proportion=self.lake_proportion)
+        forest = Forest(self.L, self.f, self.freeze_time_during_fire, self.timesteps, include_lakes=self.include_lakes, lake_proportion=self.lake_proportion, census_stride=self.census_stride,
+                        seed=None if self.seed is None else self.seed + instance_number)
         while forest.t < self.timesteps:
             forest.do_timestep()
             if self.instances == 1 and self.remember_history:
                 self.ims.append([self.animation_ax.imshow(forest.forest, animated=True, cmap = self.cmap, vmin=0, vmax=3)])
             forest.t += 1
 
+            if self.progress is not None:
+                self.progress.report(self.label, instance_number, forest)
+
+        if self.progress is not None:
+            self.progress.finish(self.label, instance_number, forest)
+
         self.fire_sizes.append(np.array([forest.previous_fires[id].size for id in forest.previous_fires]))
         self.trees_timeseries[instance_number] = forest.trees_per_timestep
         self.all_fire_lengths.extend(forest.fire_lengths)
         self.collect_fire_durations(forest)
 
+        if forest.census is not None:
+            self.cluster_census.append(forest.census.records)
+
     def run_all(self):
         """
         Calls run_one_instance the specified number of times.
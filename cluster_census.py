@@ -0,0 +1,98 @@
+import numpy as np
+from scipy import ndimage
+
+
+class ClusterCensus:
+    def __init__(self, L, stride):
+        self.L = L
+        self.stride = stride
+
+        # Logarithmic bins for cluster sizes: [1, 2), [2, 4), [4, 8), ... up to the full grid
+        self.bin_edges = 2 ** np.arange(int(np.ceil(np.log2(L * L))) + 2)
+        self.records = []
+
+    def find(self, parent, offset, label):
+        """
+        Returns the root of a label in the union-find forest, together with the position of the label relative to
+        its root, counted in periods of the grid along both axes.
+        """
+        path = []
+        while parent[label] != label:
+            path.append(label)
+            label = parent[label]
+
+        # Compress the path, making every visited label point directly to the root
+        total = (0, 0)
+        for node in reversed(path):
+            total = (total[0] + offset[node][0], total[1] + offset[node][1])
+            offset[node] = total
+            parent[node] = label
+
+        return label, (offset[path[0]] if path else (0, 0))
+
+    def label_clusters(self, grid):
+        """
+        Label connected tree clusters according to a Von Neumann neighborhood on a toroid shaped grid.
+        Only cells containing a non-burning tree are part of a cluster, so lakes, fires and empty cells act as barriers.
+        Returns the grid of labels, where 0 means no tree, the number of clusters, and a boolean array telling for each
+        cluster (label - 1) whether it winds around the toroid, i.e. percolates.
+        """
+        trees = grid == 1
+        labels, n_labels = ndimage.label(trees)
+        if n_labels == 0:
+            return labels, 0, np.zeros(0, dtype=bool)
+
+        # Clusters touching opposite edges of the grid are connected through the periodic boundaries. Crossing from the
+        # last to the first row or column moves one period along that axis.
+        source = np.concatenate((labels[-1, :], labels[:, -1]))
+        target = np.concatenate((labels[0, :], labels[:, 0]))
+        axis = np.repeat([0, 1], self.L)
+        connected = (source > 0) & (target > 0)
+        edges = np.unique(np.stack((source[connected], target[connected], axis[connected]), axis=1), axis=0)
+
+        # Merge labels with a union-find forest that remembers relative positions in periods. A cluster which is
+        # connected to a copy of itself shifted by a period winds around the toroid.
+        parent = list(range(n_labels + 1))
+        offset = [(0, 0)] * (n_labels + 1)
+        winding = []
+        for a, b, direction in edges.tolist():
+            shift = (1, 0) if direction == 0 else (0, 1)
+            root_a, offset_a = self.find(parent, offset, a)
+            root_b, offset_b = self.find(parent, offset, b)
+            relative = (offset_a[0] + shift[0] - offset_b[0], offset_a[1] + shift[1] - offset_b[1])
+            if root_a != root_b:
+                parent[root_b] = root_a
+                offset[root_b] = relative
+            elif relative != (0, 0):
+                winding.append(root_a)
+
+        roots = np.array([self.find(parent, offset, label)[0] for label in range(n_labels + 1)])
+
+        # Renumber merged clusters from 1 onwards, keeping label 0 for cells without a tree
+        unique_roots, merged = np.unique(roots[1:], return_inverse=True)
+        mapping = np.concatenate(([0], merged.ravel() + 1))
+        percolating = np.isin(unique_roots, [self.find(parent, offset, root)[0] for root in winding])
+        return mapping[labels], len(unique_roots), percolating
+
+    def take(self, grid, t):
+        """
+        Count the tree clusters currently on the grid and store a log-binned histogram of their sizes,
+        together with indicators of percolation.
+        """
+        labels, n_clusters, percolating = self.label_clusters(grid)
+        sizes = np.bincount(labels.ravel())[1:]
+        histogram, _ = np.histogram(sizes, bins=self.bin_edges)
+
+        if n_clusters > 0:
+            largest_size = sizes.max()
+        else:
+            largest_size = 0
+
+        self.records.append({
+            't': t,
+            'n_clusters': int(n_clusters),
+            'histogram': histogram,
+            'largest_cluster_fraction': float(largest_size / (self.L * self.L)),
+            'percolating': bool(percolating.any()),
+            'tree_density': float(sizes.sum() / (self.L * self.L)),
+        })
@@ -0,0 +1,153 @@
+"""Class to validate alternative simulation engines against the reference model
+
+An engine is any class with the same constructor and interface as Forest: it is created as
+engine(L, f, freeze_time_during_fire, timesteps, include_lakes, lake_proportion, seed=seed), advanced with
+do_timestep while incrementing t, and afterwards provides fire_lengths, trees_per_timestep and fire_durations.
+
+For every parameter setting in the grid, the reference and the alternative engine are run on the same seeds.
+Fire sizes and fire durations are compared with two sample Kolmogorov-Smirnov tests, the equilibrium tree
+density (mean over the latter 50% of timesteps) of the instances with Welch's t-test. A setting passes if
+none of the tests rejects equivalence, using a Bonferroni correction for the three tests: every p-value has to
+be at least alpha / 3, so an equivalent engine fails a setting with probability at most alpha.
+
+The speedup of the engine is the ratio of total run times over all seeds. Reference and engine are run
+alternately for each seed, repeats times, and the fastest run per seed is used to reduce timing noise.
+"""
+
+
+import itertools
+import random
+import time
+import numpy as np
+from scipy.stats import ks_2samp, ttest_ind
+from forest import Forest
+
+
+class EquivalenceTest:
+    def __init__(self, engine, parameter_grid, timesteps, seeds, reference=Forest, alpha=0.05, repeats=3):
+        self.engine = engine
+        self.reference = reference
+        self.timesteps = timesteps
+        self.seeds = seeds
+        self.alpha = alpha
+        self.repeats = repeats
+
+        # Bonferroni corrected significance level for the three tests per setting
+        self.threshold = alpha / 3
+
+        # Expand grid of parameter values, unspecified parameters take the values of the sample run in analysis.py
+        parameters = {'L': [50], 'f': [50], 'freeze_time_during_fire': [True], 'include_lakes': [False], 'lake_proportion': [0]}
+        parameters.update(parameter_grid)
+        self.settings = [dict(zip(parameters, values)) for values in itertools.product(*parameters.values())]
+        self.results = []
+
+    def run_one_instance(self, engine, setting, seed):
+        """
+        Run one instance of an engine for a parameter setting and seed. Returns the fire sizes, fire durations,
+        equilibrium tree density and run time.
+        """
+
+        # Seed the global random generators too, for engines which draw from those instead of using seed
+        np.random.seed(seed)
+        random.seed(seed)
+
+        start = time.perf_counter()
+        forest = engine(setting['L'], setting['f'], setting['freeze_time_during_fire'], self.timesteps,
+                        setting['include_lakes'], setting['lake_proportion'], seed=seed)
+        while forest.t < self.timesteps:
+            forest.do_timestep()
+            forest.t += 1
+        run_time = time.perf_counter() - start
+
+        fire_sizes = [size for _, size in forest.fire_lengths]
+        fire_durations = list(forest.fire_durations.values())
+        cut_off_point = int(self.timesteps / 2)
+        density = np.mean(forest.trees_per_timestep[cut_off_point:]) / (setting['L'] * setting['L'])
+        return fire_sizes, fire_durations, density, run_time
+
+    def run_engines(self, setting):
+        """
+        Run the reference and the engine alternately on all seeds and pool the results of each. Every seed is run
+        repeats times per engine, the results are taken from the first run and the run time from the fastest.
+        """
+        engines = [self.reference, self.engine]
+        fire_sizes, fire_durations, densities, total_times = [[], []], [[], []], [[], []], [0, 0]
+        for seed in self.seeds:
+            run_times = [[], []]
+            for repeat in range(self.repeats):
+                for i, engine in enumerate(engines):
+                    sizes, durations, density, run_time = self.run_one_instance(engine, setting, seed)
+                    run_times[i].append(run_time)
+                    if repeat == 0:
+                        fire_sizes[i].extend(sizes)
+                        fire_durations[i].extend(durations)
+                        densities[i].append(density)
+
+            for i in range(len(engines)):
+                total_times[i] += min(run_times[i])
+
+        return [(np.array(fire_sizes[i]), np.array(fire_durations[i]), np.array(densities[i]), total_times[i])
+                for i in range(len(engines))]
+
+    def compare_samples(self, reference_sample, engine_sample, test):
+        """
+        Returns the p-value of a two sample test. Identical samples, including two empty ones, always pass,
+        while a single empty sample always fails. If the test is undefined because neither sample varies,
+        the samples pass only if their means are equal.
+        """
+        if np.array_equal(reference_sample, engine_sample):
+            return 1.0
+        if len(reference_sample) == 0 or len(engine_sample) == 0:
+            return 0.0
+
+        p_value = test(reference_sample, engine_sample).pvalue
+        if np.isnan(p_value):
+            return 1.0 if np.mean(reference_sample) == np.mean(engine_sample) else 0.0
+        return p_value
+
+    def run(self):
+        """
+        Run both engines for each parameter setting and store a report per setting.
+        """
+        for setting in self.settings:
+            reference, engine = self.run_engines(setting)
+            reference_sizes, reference_durations, reference_densities, reference_time = reference
+            engine_sizes, engine_durations, engine_densities, engine_time = engine
+
+            p_values = {
+                'fire_sizes': self.compare_samples(reference_sizes, engine_sizes, ks_2samp),
+                'fire_durations': self.compare_samples(reference_durations, engine_durations, ks_2samp),
+                'density': self.compare_samples(reference_densities, engine_densities, lambda a, b: ttest_ind(a, b, equal_var=False)),
+            }
+
+            self.results.append({
+                'setting': setting,
+                'p_values': p_values,
+                'reference_density': np.mean(reference_densities),
+                'engine_density': np.mean(engine_densities),
+                'passed': all(p >= self.threshold for p in p_values.values()),
+                'speedup': reference_time / engine_time if engine_time > 0 else np.inf,
+            })
+
+        return self.results
+
+    def print_report(self):
+        """
+        Print whether each parameter setting passed, together with the p-values and speedup.
+        """
+        print(f'Settings pass if all p-values >= {self.threshold:.4f} (alpha = {self.alpha}, Bonferroni corrected for 3 tests)')
+        for result in self.results:
+            setting = ', '.join(f'{name}={value}' for name, value in result['setting'].items())
+            p_values = ', '.join(f'{name}: {p:.3f}' for name, p in result['p_values'].items())
+            status = 'PASS' if result['passed'] else 'FAIL'
+            print(f"{status} {setting} | p-values {p_values} | density {result['reference_density']:.3f} vs "
+                  f"{result['engine_density']:.3f} | speedup {result['speedup']:.2f}x")
+
+        print(f"{sum(result['passed'] for result in self.results)}/{len(self.results)} settings passed")
+
+
+# Sample use of the class, validating the reference model against itself
+if __name__ == '__main__':
+    equivalence_test = EquivalenceTest(Forest, {'L': [30, 50], 'f': [50, 100]}, 10**4, seeds=range(10))
+    equivalence_test.run()
+    equivalence_test.print_report()
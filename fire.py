@@ -1,5 +1,3 @@
-import numpy as np
-
 
 class Fire:
     def __init__(self, t_ignited, origin, id, forest):
@@ -43,7 +41,7 @@ class Fire:
                 if self.forest.include_lakes and self.forest.forest[neighbor] == 3:
                     continue
 
-                random_num = np.random.rand(1)[0]
+                random_num = self.forest.random_stream.uniform()
                 
                 # Apply wind effect if enabled
                 if self.forest.wind_effects_enabled:
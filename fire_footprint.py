@@ -0,0 +1,123 @@
+from array import array
+import numpy as np
+
+
+class FireFootprint:
+    def __init__(self, L):
+        self.L = L
+
+        # Shared append-only buffers for all extinguished fires. Cells are stored as flat indices (x * L + y)
+        # in order of ignition, ignition times are run-length encoded as (time, number of cells) pairs.
+        self.cells = array('q')
+        self.run_times = array('q')
+        self.run_lengths = array('q')
+
+        # Per fire offsets into the shared buffers, fire i owns cells[cell_offsets[i]:cell_offsets[i + 1]]
+        self.fire_ids = array('q')
+        self.cell_offsets = array('q', [0])
+        self.run_offsets = array('q', [0])
+        self.index = {}
+
+        # Footprints of fires which are still burning
+        self.pending = {}
+
+    def record(self, fire_id, coordinates, t):
+        """
+        Store the cells which have been ignited by a burning fire at timestep t.
+        """
+        if len(coordinates) == 0:
+            return
+
+        cells, run_times, run_lengths = self.pending.setdefault(fire_id, (array('q'), array('q'), array('q')))
+        cells.extend(x * self.L + y for x, y in coordinates)
+
+        # Extend last run if cells were already ignited during this timestep
+        if len(run_times) > 0 and run_times[-1] == t:
+            run_lengths[-1] += len(coordinates)
+        else:
+            run_times.append(t)
+            run_lengths.append(len(coordinates))
+
+    def finish(self, fire_id):
+        """
+        Move the footprint of an extinguished fire to the shared buffers.
+        """
+        if fire_id not in self.pending:
+            return
+
+        cells, run_times, run_lengths = self.pending.pop(fire_id)
+        self.index[fire_id] = len(self.fire_ids)
+        self.fire_ids.append(fire_id)
+        self.cells.extend(cells)
+        self.run_times.extend(run_times)
+        self.run_lengths.extend(run_lengths)
+        self.cell_offsets.append(len(self.cells))
+        self.run_offsets.append(len(self.run_times))
+
+    def get_footprint(self, fire_id):
+        """
+        Returns the flat cell indices, run times and run lengths of a fire. Fires which are still burning
+        are read from their pending footprint.
+        """
+        if fire_id in self.pending:
+            cells, run_times, run_lengths = self.pending[fire_id]
+        else:
+            i = self.index[fire_id]
+            cells = self.cells[self.cell_offsets[i]:self.cell_offsets[i + 1]]
+            run_times = self.run_times[self.run_offsets[i]:self.run_offsets[i + 1]]
+            run_lengths = self.run_lengths[self.run_offsets[i]:self.run_offsets[i + 1]]
+
+        # Copy, as numpy arrays sharing memory with an array would prevent it from growing
+        return np.array(cells, dtype=np.int64), np.array(run_times, dtype=np.int64), np.array(run_lengths, dtype=np.int64)
+
+    def get_cells(self, fire_id):
+        """
+        Returns the x and y coordinates of all cells burned by a fire so far, in order of ignition.
+        """
+        flat, _, _ = self.get_footprint(fire_id)
+        return flat // self.L, flat % self.L
+
+    def get_ignition_times(self, fire_id):
+        """
+        Returns the timestep at which each cell of a fire was ignited, matching the order of get_cells.
+        """
+        times, areas = self.burn_front_area(fire_id)
+        return np.repeat(times, areas)
+
+    def burn_front_area(self, fire_id):
+        """
+        Returns the timesteps during which a fire spread and the number of cells ignited at each of them.
+        """
+        _, times, areas = self.get_footprint(fire_id)
+        return times, areas
+
+    def unwrap(self, coordinates):
+        """
+        Shift coordinates along one axis of the toroid grid such that the cells of a fire crossing an edge
+        become contiguous. The cut is made at the largest gap between occupied rows or columns.
+        """
+        occupied = np.unique(coordinates)
+        if len(occupied) == self.L:
+            return coordinates
+
+        # Gaps between consecutive occupied values, including the one wrapping around the edge
+        gaps = np.diff(np.append(occupied, occupied[0] + self.L))
+        start = occupied[(np.argmax(gaps) + 1) % len(occupied)]
+        return np.where(coordinates < start, coordinates + self.L, coordinates)
+
+    def bounding_box(self, fire_id):
+        """
+        Returns ((x_min, x_max), (y_min, y_max)) of a fire. Fires crossing an edge of the grid have
+        maximum values of L or larger, which should be taken modulo L.
+        """
+        x, y = self.get_cells(fire_id)
+        x, y = self.unwrap(x), self.unwrap(y)
+        return (int(x.min()), int(x.max())), (int(y.min()), int(y.max()))
+
+    def radius_of_gyration(self, fire_id):
+        """
+        Returns the root mean square distance of the burned cells of a fire to their centre of mass.
+        """
+        x, y = self.get_cells(fire_id)
+        x, y = self.unwrap(x), self.unwrap(y)
+        return np.sqrt(np.mean((x - x.mean()) ** 2 + (y - y.mean()) ** 2))
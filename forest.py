@@ -1,12 +1,14 @@
-import random
 import numpy as np
 from tree import Tree
 from fire import Fire
+from random_stream import RandomStream
+from fire_footprint import FireFootprint
+from cluster_census import ClusterCensus
 
 
 class Forest:
 
-    def __init__(self, L, f, freeze_time_during_fire, timesteps, include_lakes, lake_proportion,  wind=(0, 0), wind_effects_enabled=False,):
+    def __init__(self, L, f, freeze_time_during_fire, timesteps, include_lakes, lake_proportion,  wind=(0, 0), wind_effects_enabled=False, seed=None, record_footprints=False, census_stride=None):
         self.L = L
         self.lightning_frequency = f
         self.freeze_time_during_fire = freeze_time_during_fire
@@ -24,6 +26,14 @@ class Forest:
         self.lake_proportion = lake_proportion
         self.fire_lengths = []
         self.fire_durations = {}
+        self.random_stream = RandomStream(L, seed)
+
+        # Optionally store the cells burned by each fire
+        self.footprints = FireFootprint(L) if record_footprints else None
+
+        # Optionally count tree clusters every census_stride timesteps
+        self.census = ClusterCensus(L, census_stride) if census_stride else None
+
         if self.include_lakes:
             self.initialize_lakes()
 
@@ -42,7 +52,7 @@ class Forest:
         while True:
 
             # Select random cell
-            x, y = np.random.randint(self.L, size=2)
+            x, y = self.random_stream.coordinates()
 
             # Plant tree unless cell is part of a lake
             if self.forest[x, y] != 3:
@@ -74,6 +84,9 @@ class Forest:
                 # Remove from dictionary containing non-burning trees
                 del self.trees[ignited_tree]
 
+            if self.footprints is not None:
+                self.footprints.record(fire.id, fire.ignited_trees, self.t)
+
             # Reset list with just ignited trees as they are now all properly burning
             fire.ignited_trees = []
 
@@ -85,7 +98,7 @@ class Forest:
         """
 
         # Select random location on grid
-        location = tuple(np.random.randint(self.L, size=2))
+        location = self.random_stream.coordinates()
 
         # If location has tree, ignite it
         if location in self.trees:
@@ -100,6 +113,9 @@ class Forest:
             self.trees[location].t_ignited = self.t
             fire.burning_trees[location] = self.trees[location]
 
+            if self.footprints is not None:
+                self.footprints.record(id, [location], self.t)
+
             # Remove from dictionary containing non-burning trees
             del self.trees[location]
             
@@ -151,6 +167,9 @@ class Forest:
                 # Record fire length and timestep
                 self.fire_lengths.append((fire.t_extinguished, fire.size))
 
+                if self.footprints is not None:
+                    self.footprints.finish(id)
+
     def initialize_lakes(self):
         """
         Initialize lakes within the forest grid
@@ -163,7 +182,7 @@ class Forest:
 
         for _ in range(lakes_to_create):
             # Select a random starting point for the lake
-            x, y = np.random.randint(self.L, size=2)
+            x, y = self.random_stream.coordinates()
             self.expand_lake(x, y, lake_cells // lakes_to_create)
 
     def expand_lake(self, x, y, size):
@@ -186,9 +205,9 @@ class Forest:
             # A random direction from unvisited or all directions if no unvisited
             unvisited_directions = [d for d in directions if (x + d[0], y + d[1]) not in visited and 0 <= x + d[0] < self.L and 0 <= y + d[1] < self.L]
             if unvisited_directions:
-                dx, dy = random.choice(unvisited_directions)
+                dx, dy = self.random_stream.choice(unvisited_directions)
             else:
-                dx, dy = random.choice(directions)
+                dx, dy = self.random_stream.choice(directions)
 
             x = max(0, min(x + dx, self.L - 1))
             y = max(0, min(y + dy, self.L - 1))
@@ -223,4 +242,7 @@ class Forest:
         self.update_fires()
         self.trees_per_timestep.append(len(self.trees))
 
+        if self.census is not None and self.t % self.census.stride == 0:
+            self.census.take(self.forest, self.t)
+
 
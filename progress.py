@@ -0,0 +1,220 @@
+"""Classes to follow the progress of long running simulations
+
+A ProgressReporter is passed to Analyse or SensitivityAnalysis and publishes the timestep rate, tree density
+and number of active fires of each running instance, at most once per interval. Messages are sent to a queue,
+a callback or a local UDP port, and are dropped rather than delaying the simulation when the receiver cannot
+keep up. Callbacks are called from a background thread, so a slow callback does not slow down the simulation.
+A ProgressMonitor collects these messages from one or more worker processes and summarizes them.
+
+Running this file starts a monitor listening on a local port, e.g. `python progress.py 50007`.
+"""
+
+
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+
+
+class ProgressReporter:
+    def __init__(self, target, interval=1.0, queue_size=1000):
+        self.target = target
+        self.interval = interval
+
+        # Time and timestep of the last message per instance, used for the timestep rate
+        self.last_report = {}
+
+        # Integers or (host, port) tuples are interpreted as a local UDP port
+        self.socket = None
+        if isinstance(target, (int, tuple)):
+            self.address = ('127.0.0.1', target) if isinstance(target, int) else target
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.setblocking(False)
+
+        # Queues are written to directly, callbacks are fed from a bounded queue by a background thread
+        elif hasattr(target, 'put_nowait'):
+            self.queue = target
+        else:
+            self.queue = queue.Queue(maxsize=queue_size)
+            self.failed_callbacks = 0
+            threading.Thread(target=self.call_back, daemon=True).start()
+
+    def report(self, source, instance, forest, finished=False):
+        """
+        Publish the state of a running forest, unless the previous message for this instance was sent less than
+        interval seconds ago. Always publishes when the instance is finished.
+        """
+        now = time.monotonic()
+        key = (source, instance)
+
+        if key not in self.last_report:
+            self.last_report[key] = (now, forest.t)
+            if not finished:
+                return
+
+        last_time, last_t = self.last_report[key]
+        if now - last_time < self.interval and not finished:
+            return
+
+        self.last_report[key] = (now, forest.t)
+        self.publish({
+            'pid': os.getpid(),
+            'source': source,
+            'instance': instance,
+            't': forest.t,
+            'timesteps': forest.timesteps,
+            'rate': (forest.t - last_t) / (now - last_time) if now > last_time else 0.0,
+            'tree_density': len(forest.trees) / (forest.L * forest.L),
+            'active_fires': len(forest.fires),
+            'finished': finished,
+        })
+
+    def finish(self, source, instance, forest):
+        """
+        Publish the final state of an instance.
+        """
+        self.report(source, instance, forest, finished=True)
+        del self.last_report[(source, instance)]
+
+    def publish(self, message):
+        """
+        Send a message to the target without blocking. Messages which cannot be delivered immediately are dropped.
+        """
+        if self.socket is not None:
+            try:
+                self.socket.sendto(json.dumps(message).encode(), self.address)
+            except OSError:
+                pass
+        else:
+            try:
+                self.queue.put_nowait(message)
+            except queue.Full:
+                pass
+
+    def call_back(self):
+        """
+        Pass queued messages to the callback, runs in a background thread. Messages for which the callback raises an
+        exception are counted in failed_callbacks, so a faulty callback does not stop the reporting.
+        """
+        while True:
+            message = self.queue.get()
+            try:
+                self.target(message)
+            except Exception:
+                self.failed_callbacks += 1
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """
+        Wait until all queued messages have been passed to the callback.
+        """
+        if self.socket is None and self.queue is not self.target:
+            self.queue.join()
+
+
+class ProgressMonitor:
+    def __init__(self, source, stall_after=30.0):
+        self.source = source
+        self.stall_after = stall_after
+
+        # Most recent message per (process, source, instance)
+        self.latest = {}
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+        # Integers or (host, port) tuples are interpreted as a local UDP port to listen on
+        self.socket = None
+        if isinstance(source, (int, tuple)):
+            address = ('127.0.0.1', source) if isinstance(source, int) else source
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.bind(address)
+            self.socket.settimeout(0.5)
+
+    def receive(self):
+        """
+        Wait shortly for the next message. Returns None if nothing arrived.
+        """
+        if self.socket is not None:
+            try:
+                data, _ = self.socket.recvfrom(65536)
+            except socket.timeout:
+                return None
+            return json.loads(data.decode())
+
+        try:
+            return self.source.get(timeout=0.5)
+        except queue.Empty:
+            return None
+
+    def update(self, message):
+        """
+        Store a message as the latest state of its instance.
+        """
+        message['received'] = time.monotonic()
+        with self.lock:
+            self.latest[(message['pid'], message['source'], message['instance'])] = message
+
+    def listen(self):
+        while self.running:
+            message = self.receive()
+            if message is not None:
+                self.update(message)
+
+    def start(self):
+        """
+        Start collecting messages in a background thread.
+        """
+        self.running = True
+        self.thread = threading.Thread(target=self.listen, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+        if self.socket is not None:
+            self.socket.close()
+
+    def summary(self):
+        """
+        Returns the latest message of every instance, with an added flag telling whether the instance has not
+        reported for more than stall_after seconds.
+        """
+        now = time.monotonic()
+        with self.lock:
+            messages = [dict(message) for message in self.latest.values()]
+
+        for message in messages:
+            message['stalled'] = not message['finished'] and now - message['received'] > self.stall_after
+        return sorted(messages, key=lambda message: (str(message['source']), message['instance']))
+
+    def print_summary(self):
+        """
+        Print one line per instance, followed by the total timestep rate over all running instances.
+        """
+        messages = self.summary()
+        for message in messages:
+            status = 'finished' if message['finished'] else 'STALLED' if message['stalled'] else 'running'
+            print(f"[{message['pid']}] {message['source']} #{message['instance']}: "
+                  f"t = {message['t']}/{message['timesteps']}, {message['rate']:.0f} steps/s, "
+                  f"density = {message['tree_density']:.3f}, fires = {message['active_fires']}, {status}")
+
+        total_rate = sum(message['rate'] for message in messages if not message['finished'])
+        print(f'{len(messages)} instances, {total_rate:.0f} steps/s in total')
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 50007
+    monitor = ProgressMonitor(port)
+    monitor.start()
+    try:
+        while True:
+            time.sleep(5)
+            monitor.print_summary()
+    except KeyboardInterrupt:
+        monitor.stop()
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class RandomStream:
+    def __init__(self, L, seed=None, block_size=4096):
+        self.L = L
+        self.block_size = block_size
+
+        # Without a seed, derive one from the global NumPy state so np.random.seed keeps runs reproducible
+        if seed is None:
+            seed = np.random.randint(2**32, dtype=np.uint32)
+        self.generator = np.random.default_rng(seed)
+
+        # Pre-generated blocks and the position of the next unused value in each
+        self.coordinate_block = []
+        self.coordinate_index = 0
+        self.uniform_block = []
+        self.uniform_index = 0
+
+    def refill_coordinates(self):
+        """
+        Draw a new block of grid coordinates, uniformly distributed over the L x L grid.
+        """
+        self.coordinate_block = [tuple(pair) for pair in self.generator.integers(self.L, size=(self.block_size, 2)).tolist()]
+        self.coordinate_index = 0
+
+    def refill_uniforms(self):
+        """
+        Draw a new block of uniform random numbers on the interval [0, 1).
+        """
+        self.uniform_block = self.generator.random(self.block_size).tolist()
+        self.uniform_index = 0
+
+    def coordinates(self):
+        """
+        Returns a random cell (x, y) of the grid, refilling the block when it is used up.
+        """
+        if self.coordinate_index == len(self.coordinate_block):
+            self.refill_coordinates()
+
+        coordinate = self.coordinate_block[self.coordinate_index]
+        self.coordinate_index += 1
+        return coordinate
+
+    def uniform(self):
+        """
+        Returns a random number on the interval [0, 1), refilling the block when it is used up.
+        """
+        if self.uniform_index == len(self.uniform_block):
+            self.refill_uniforms()
+
+        random_num = self.uniform_block[self.uniform_index]
+        self.uniform_index += 1
+        return random_num
+
+    def choice(self, options):
+        """
+        Returns a random element of a non-empty sequence.
+        """
+        return options[int(self.uniform() * len(options))]
+
+    def get_state(self):
+        """
+        Returns a checkpoint of the stream, containing the grid size, block size, generator state and the unused
+        part of both blocks.
+        """
+        return {
+            'L': self.L,
+            'block_size': self.block_size,
+            'generator': self.generator.bit_generator.state,
+            'coordinate_block': self.coordinate_block[self.coordinate_index:],
+            'uniform_block': self.uniform_block[self.uniform_index:],
+        }
+
+    def set_state(self, state):
+        """
+        Restores a checkpoint made by get_state, after which the stream continues exactly where it was.
+        """
+        self.L = state['L']
+        self.block_size = state['block_size']
+        self.generator.bit_generator.state = state['generator']
+        self.coordinate_block = list(state['coordinate_block'])
+        self.coordinate_index = 0
+        self.uniform_block = list(state['uniform_block'])
+        self.uniform_index = 0
@@ -15,7 +15,7 @@ import pandas as pd
 
 class SensitivityAnalysis:
 
-    def __init__(self, L, f, parameter_to_change, range_min, range_max, range_step, time_steps, instances, include_lakes, lake_proportion):
+    def __init__(self, L, f, parameter_to_change, range_min, range_max, range_step, time_steps, instances, include_lakes, lake_proportion, progress=None, seed=None):
         self.model_parameters = {'L': L,'f':f, 'p': lake_proportion}
         self.parameter_to_change = parameter_to_change
         self.parameter_range = np.arange(range_min, range_max + range_step, range_step)
@@ -28,6 +28,8 @@ class SensitivityAnalysis:
         self.mean_fire_sizes_data = []
         self.average_tree_densities_data = []
         self.include_lakes = include_lakes
+        self.progress = progress
+        self.seed = seed
 
     def run(self):
         """
@@ -38,7 +40,7 @@ class SensitivityAnalysis:
             self.model_parameters[self.parameter_to_change] = parameter
             L, f, p = self.model_parameters.values()
 
-            analysis = Analyse(L, f, True, False, self.time_steps, self.instances, p, self.include_lakes )
+            analysis = Analyse(L, f, True, False, self.time_steps, self.instances, p, self.include_lakes, progress=self.progress, seed=self.seed)
             analysis.run_all()
             analysis.find_best_fitting_distributions()
             